@@ -7,30 +7,355 @@ interface for local llama.cpp. It contains two primary classes:
 - LlamaCPPEngine: A front-facing adapter that accepts a JobInput and transforms
   it into OpenAI-compatible routes and payloads. It normalizes prompt vs chat
   input and delegates actual interaction to an OpenAI-style engine.
-- LlamaCPPOpenAIEngine: A concrete engine that uses the OpenAI client (pointing
-  at a locally hosted inference service) to list models and create completions
-  or chat completions. It supports both non-streaming and streaming responses.
+- LlamaCPPOpenAIEngine: A concrete engine that uses the async OpenAI client
+  (pointing at a locally hosted inference service) to list models and create
+  completions or chat completions. It supports both non-streaming and
+  streaming responses.
 
 Environment:
 - The OpenAI client is configured to point at a local base_url in this script.
+  It is an AsyncOpenAI client so that concurrent jobs do not block the event
+  loop while waiting on the server, backed by a single httpx connection pool
+  that keeps connections to the server alive across jobs.
+- MODEL_ID sets the model used for prompt/messages jobs, skipping the lookup
+  of the first model listed by the server.
+- CACHE_ENABLED, CACHE_TTL and CACHE_MAX configure the in-process cache for
+  deterministic (temperature == 0), non-streaming responses.
+- DISK_CACHE_DIR and DISK_CACHE_BYTES configure the disk cache for
+  deterministic, non-streaming responses of jobs with enable_cache set.
+- LLAMA_CACHE_PROMPT controls whether llama.cpp is asked to reuse the KV cache
+  of previous requests sharing a prompt prefix.
+- UPSTREAM_PARALLEL bounds the number of requests in flight to llama.cpp and
+  should match the server's --parallel setting.
+- MAX_BATCH_PROMPTS limits the number of entries in a "prompts" batch job.
+- STREAM_COALESCE_MS sets the window in which streaming chunks are combined
+  before being yielded (0 disables coalescing).
 
 Typical usage:
-- Construct LlamaCPPEngine() and call its async generate() with a JobInput.
+- Construct LlamaCPPEngine() once and call its async generate() with a
+  JobInput for each job.
 - The generator yields either dicts (non-stream responses) or streaming chunks
   formatted as strings when stream=True.
 """
 
-import json
-
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional
+
+import diskcache
+import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from openai import OpenAI
-from utils import JobInput
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+# Load environment variables once, at import time
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool for all requests to the local server, sized so that
+# concurrent jobs reuse kept-alive connections instead of opening new ones
+http_client = DefaultAsyncHttpxClient(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
 
-client = OpenAI(
+client = AsyncOpenAI(
     base_url="http://localhost:3098/v1/",
     api_key="",
+    http_client=http_client,
 )
 
+# The llama.cpp server hosts a fixed set of models for the lifetime of the
+# worker, so the default model id only needs to be fetched once. If MODEL_ID
+# is set, it is used directly and the server is never asked.
+_MODEL_ID: Optional[str] = os.getenv("MODEL_ID") or None
+_MODEL_LOCK = asyncio.Lock()
+
+
+async def _get_default_model():
+    """
+    Return the id of the default model (the first model listed by the server
+    upon requesting /v1/models).
+
+    If the MODEL_ID environment variable is set, its value is returned.
+    Otherwise, the id is fetched on first use and cached in a module-level
+    variable for all subsequent requests. The lock ensures that concurrent
+    jobs arriving before the cache is populated only trigger a single fetch.
+
+    Returns:
+        str: The id of the default model.
+    """
+
+    global _MODEL_ID
+
+    if _MODEL_ID is None:
+        async with _MODEL_LOCK:
+            if _MODEL_ID is None:
+                _MODEL_ID = (await client.models.list()).data[0].id
+
+    return _MODEL_ID
+
+
+# Cache for non-streaming responses of deterministic requests, so repeated
+# identical requests are answered without another forward pass. It holds the
+# raw response bodies, so every hit is parsed into a fresh dict that callers
+# may freely modify.
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_CACHE_MAX = 1024
+
+_CACHE_MAX = int(os.getenv("CACHE_MAX", DEFAULT_CACHE_MAX))
+
+# A cache that cannot hold a single entry is treated as disabled
+_CACHE_ENABLED = _CACHE_MAX > 0 and os.getenv(
+    "CACHE_ENABLED", "false"
+).lower() in ("1", "true", "yes")
+_RESPONSE_CACHE = TTLCache(
+    maxsize=max(_CACHE_MAX, 1),
+    ttl=int(os.getenv("CACHE_TTL", DEFAULT_CACHE_TTL)),
+)
+
+# Optional disk-backed cache for deterministic, non-streaming responses of
+# jobs with enable_cache set, e.g. evaluations re-run over the same prompts
+DEFAULT_DISK_CACHE_DIR = "/tmp/llm_cache"
+DEFAULT_DISK_CACHE_BYTES = 10 * 2**30
+
+# The cache is only created once a job asks for it, so workers that never
+# use it do not touch DISK_CACHE_DIR at all
+_DISK_CACHE: Optional[diskcache.Cache] = None
+_DISK_CACHE_LOCK = threading.Lock()
+
+# Ask llama.cpp to reuse the KV cache for shared prompt prefixes (system
+# prompts, multi-turn chats) instead of evaluating the full prompt again
+_CACHE_PROMPT = os.getenv("LLAMA_CACHE_PROMPT", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Limit the number of simultaneous requests to llama.cpp to its number of
+# slots (--parallel), so excess jobs wait here in FIFO order instead of
+# growing the server's queue and slowing down requests already in flight
+DEFAULT_UPSTREAM_PARALLEL = 4
+
+_UPSTREAM_PARALLEL = int(
+    os.getenv("UPSTREAM_PARALLEL", DEFAULT_UPSTREAM_PARALLEL)
+)
+
+if _UPSTREAM_PARALLEL < 1:
+    logger.warning(
+        "UPSTREAM_PARALLEL must be at least 1, got %s; using 1",
+        _UPSTREAM_PARALLEL,
+    )
+    _UPSTREAM_PARALLEL = 1
+
+_UPSTREAM_SEM = asyncio.Semaphore(_UPSTREAM_PARALLEL)
+
+# Maximum number of entries in a single "prompts" batch job
+DEFAULT_MAX_BATCH_PROMPTS = 256
+
+_MAX_BATCH_PROMPTS = int(
+    os.getenv("MAX_BATCH_PROMPTS", DEFAULT_MAX_BATCH_PROMPTS)
+)
+
+# Streaming chunks arriving within this window are yielded together, so fewer
+# items pass through the handler and runpod's stream aggregation
+DEFAULT_STREAM_COALESCE_MS = 10
+STREAM_COALESCE_MAX_CHARS = 4096
+
+_STREAM_COALESCE_SECONDS = (
+    float(os.getenv("STREAM_COALESCE_MS", DEFAULT_STREAM_COALESCE_MS)) / 1000
+)
+
+# Server-sent event framing of streamed chunks
+SSE_PREFIX = "data: "
+SSE_SUFFIX = "\n\n"
+SSE_DONE = SSE_PREFIX + "[DONE]"
+
+
+def _get_disk_cache():
+    """
+    Return the disk cache, creating it on first use.
+
+    Returns:
+        diskcache.Cache: The cache located at DISK_CACHE_DIR.
+    """
+
+    global _DISK_CACHE
+
+    if _DISK_CACHE is None:
+        with _DISK_CACHE_LOCK:
+            if _DISK_CACHE is None:
+                _DISK_CACHE = diskcache.Cache(
+                    os.getenv("DISK_CACHE_DIR", DEFAULT_DISK_CACHE_DIR),
+                    size_limit=int(
+                        os.getenv("DISK_CACHE_BYTES", DEFAULT_DISK_CACHE_BYTES)
+                    ),
+                )
+
+    return _DISK_CACHE
+
+
+def _response_cache_set(key, body):
+    """
+    Store a raw response body in the in-process response cache.
+
+    Errors are logged and otherwise ignored, so that a failing cache never
+    discards a response.
+
+    Args:
+        key (bytes): The key built by _response_cache_key.
+        body (bytes): The response body to store.
+    """
+
+    try:
+        _RESPONSE_CACHE[key] = body
+    except Exception as e:
+        logger.warning("response cache store failed: %s", e)
+
+
+async def _disk_cache_get(key):
+    """
+    Look up a raw response body in the disk cache.
+
+    The disk cache is synchronous, so it is accessed in a thread to keep the
+    event loop free. Errors (e.g. an unwritable directory or a locked
+    database) are logged and treated as a miss.
+
+    Args:
+        key (bytes): The key built by _response_cache_key.
+
+    Returns:
+        bytes or None: The cached response body, or None on a miss.
+    """
+
+    try:
+        return await asyncio.to_thread(lambda: _get_disk_cache().get(key))
+    except Exception as e:
+        logger.warning("disk cache lookup failed: %s", e)
+        return None
+
+
+async def _disk_cache_set(key, body):
+    """
+    Store a raw response body in the disk cache.
+
+    Like _disk_cache_get, this runs in a thread; errors are logged and
+    otherwise ignored so that a failing cache never discards a response.
+
+    Args:
+        key (bytes): The key built by _response_cache_key.
+        body (bytes): The response body to store.
+    """
+
+    try:
+        await asyncio.to_thread(lambda: _get_disk_cache().set(key, body))
+    except Exception as e:
+        logger.warning("disk cache store failed: %s", e)
+
+
+def _response_cache_key(openai_input):
+    """
+    Build a response cache key for an OpenAI-style request payload.
+
+    The key is a hash over the payload (model, messages/prompt and sampling
+    parameters), excluding the "stream" flag.
+
+    Args:
+        openai_input (dict): Parameters passed to the client's create method.
+
+    Returns:
+        bytes: The digest identifying the request.
+    """
+
+    payload = {k: v for k, v in openai_input.items() if k != "stream"}
+
+    return hashlib.blake2b(
+        orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    ).digest()
+
+
+async def _coalesce(chunks):
+    """
+    Combine string chunks of an async iterator that arrive close together.
+
+    A batch is yielded once STREAM_COALESCE_MS have passed since its first
+    chunk arrived without the iterator producing the next one, or once it
+    reaches STREAM_COALESCE_MAX_CHARS characters. If the window is 0, chunks
+    are passed through unchanged.
+
+    Args:
+        chunks (AsyncIterator[str]): The chunks to combine.
+
+    Yields:
+        str: The concatenation of one or more consecutive chunks.
+    """
+
+    if _STREAM_COALESCE_SECONDS <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer = []
+    size = 0
+    deadline = 0.0
+    pending = None
+
+    try:
+        while True:
+            # The next chunk is fetched in a task so that waiting for it can
+            # time out without cancelling the underlying iterator
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            if buffer:
+                timeout = max(deadline - loop.time(), 0)
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+                if not done:
+                    yield "".join(buffer)
+                    buffer = []
+                    size = 0
+                    continue
+
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                pending = None
+                break
+            except Exception:
+                pending = None
+
+                # Do not lose chunks received before the iterator failed
+                if buffer:
+                    yield "".join(buffer)
+
+                raise
+
+            pending = None
+
+            if not buffer:
+                deadline = loop.time() + _STREAM_COALESCE_SECONDS
+
+            buffer.append(chunk)
+            size += len(chunk)
+
+            if size >= STREAM_COALESCE_MAX_CHARS:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
 
 class LlamaCPPEngine:
     """
@@ -52,38 +377,45 @@ class LlamaCPPEngine:
         """
         Initialize the LlamaCPPEngine.
 
-        Loads environment variables (via python-dotenv). This constructor does
-        not perform network calls and is intentionally lightweight to allow
-        quick instantiation in worker processes.
+        This constructor does not perform network calls and is intentionally
+        lightweight. Environment variables are loaded once when the module is
+        imported. A single instance is meant to be reused across jobs.
 
         Example:
             engine = LlamaCPPEngine()
         """
 
-        load_dotenv()
-        print("Llama.cpp engine initialized")
+        logger.info("Llama.cpp engine initialized")
 
     async def generate(self, job_input):
         """
         Asynchronously generate responses for a given JobInput.
 
-        The method inspects job_input.llm_input and builds an OpenAI-compatible
-        JobInput object that routes to either "/v1/completions" or
-        "/v1/chat/completions". It then delegates to LlamaCPPOpenAIEngine to
-        perform the actual request and yields each response chunk produced by
-        that engine.
+        The method uses job_input.is_chat to build an OpenAI-compatible
+        payload for either "/v1/completions" or "/v1/chat/completions". It
+        then calls LlamaCPPOpenAIEngine.generate_chat_or_completion directly
+        to perform the actual request and yields each response chunk produced
+        by that engine.
 
         Args:
             job_input (utils.JobInput): Input job object that contains at \
             least:
                 - llm_input: either a prompt string (for completions) or a list
                   of chat messages (for chat completion).
+                - is_chat: whether llm_input holds chat messages.
+                - temperature: optional sampling temperature.
                 - stream: boolean indicating whether a streaming response is
                   desired.
+                - llm_inputs: optional non-empty list of prompts and/or
+                  message lists (at most MAX_BATCH_PROMPTS), processed
+                  concurrently without streaming; it must not be combined
+                  with llm_input or stream.
 
         Yields:
             dict or str: Each yielded item is either:
                 - a dict representing a non-streaming response,
+                - for llm_inputs, a dict {"index": i, "output": <response>}
+                  per input, in order of completion,
                 - a string that contains streaming "data: ..." chunks for
                   stream=True,
                 - or an error dict with an "error" key.
@@ -92,53 +424,148 @@ class LlamaCPPEngine:
             - This method does not validate the full schema of job_input; it
               relies on upstream code to supply a correctly shaped JobInput.
             - The default model selection uses the first model listed by the
-              server upon requesting /v1/models.
+              server upon requesting /v1/models. It is fetched once and
+              cached for subsequent requests.
         """
 
-        openAIEngine = LlamaCPPOpenAIEngine()
+        if job_input.llm_inputs is not None:
+            if (
+                not isinstance(job_input.llm_inputs, list)
+                or not job_input.llm_inputs
+            ):
+                yield {"error": "prompts must be a non-empty list"}
+                return
 
-        # Get model to use (defaults to first model in list of models)
-        model = client.models.list().data[0].id
-
-        # Depending if prompt is a string or a list, we need to handle it
-        # differently and send it to the OpenAI API
-        if isinstance(job_input.llm_input, str):
-            # Build new JobInput object with the OpenAI route and input
-            openAIjob = JobInput(
-                {
-                    "openai_route": "/v1/completions",
-                    "openai_input": {
-                        "model": model,
-                        "prompt": job_input.llm_input,
-                        "stream": job_input.stream,
-                    },
+            if len(job_input.llm_inputs) > _MAX_BATCH_PROMPTS:
+                yield {
+                    "error": "prompts must not contain more than "
+                    f"{_MAX_BATCH_PROMPTS} entries"
                 }
-            )
-        else:
-            # Build new JobInput object with the OpenAI route and input
-            openAIjob = JobInput(
-                {
-                    "openai_route": "/v1/chat/completions",
-                    "openai_input": {
-                        "model": model,
-                        "messages": job_input.llm_input,
-                        "stream": job_input.stream,
-                    },
+                return
+
+            if job_input.llm_input is not None or job_input.stream:
+                yield {
+                    "error": "prompts cannot be combined with prompt, "
+                    "messages or stream"
                 }
-            )
+                return
 
-        print("Generating response for job_input:", job_input)
-        print("OpenAI job:", openAIjob)
+        # Get model to use (defaults to first model in list of models)
+        model = await _get_default_model()
+
+        # Multiple prompts are dispatched concurrently, so that llama.cpp can
+        # process them together in its parallel slots
+        if job_input.llm_inputs is not None:
+            async for result in self._generate_batch(
+                job_input.llm_inputs,
+                model,
+                temperature=job_input.temperature,
+                disk_cache=job_input.enable_cache,
+            ):
+                yield result
+            return
+
+        # Depending if the job contains messages or a prompt, we need to
+        # handle it differently and send it to the OpenAI API
+        chat = job_input.is_chat
+
+        if chat:
+            openai_input = {
+                "model": model,
+                "messages": job_input.llm_input,
+                "stream": job_input.stream,
+            }
+        else:
+            openai_input = {
+                "model": model,
+                "prompt": job_input.llm_input,
+                "stream": job_input.stream,
+            }
 
-        # Create a generator that will yield the response from the OpenAI API
-        generate = openAIEngine.generate(openAIjob)
+        if job_input.temperature is not None:
+            openai_input["temperature"] = job_input.temperature
+
+        logger.debug("generating: chat=%s model=%s", chat, model)
 
         # Yield the response from the OpenAI API
-        async for batch in generate:
+        async for batch in openai_engine.generate_chat_or_completion(
+            openai_input, chat=chat, disk_cache=job_input.enable_cache
+        ):
             yield batch
 
+    async def _generate_batch(
+        self, llm_inputs, model, temperature=None, disk_cache=False
+    ):
+        """
+        Generate non-streaming responses for multiple inputs concurrently.
+
+        Each input is sent to the server as its own request, with at most
+        UPSTREAM_PARALLEL - 1 (but at least one) of them in flight at a time.
+        This lets llama.cpp's continuous batching evaluate them together
+        while leaving a slot for other jobs. Results are yielded in the order
+        in which they complete.
 
-class LlamaCPPOpenAIEngine(LlamaCPPEngine):
+        Args:
+            llm_inputs (list): Prompt strings and/or lists of chat messages.
+            model (str): The model to use for all requests.
+            temperature (float): Sampling temperature for all requests, or
+                None to use the server's default.
+            disk_cache (bool): Whether to use the disk cache for the requests.
+
+        Yields:
+            dict: {"index": <position in llm_inputs>, "output": <response>},
+                where the response is a non-streaming response dict or an
+                error dict.
+        """
+
+        async def run(index, llm_input):
+            chat = not isinstance(llm_input, str)
+            openai_input = {
+                "model": model,
+                "messages" if chat else "prompt": llm_input,
+                "stream": False,
+            }
+
+            if temperature is not None:
+                openai_input["temperature"] = temperature
+
+            results = [
+                result
+                async for result in openai_engine.generate_chat_or_completion(
+                    openai_input, chat=chat, disk_cache=disk_cache
+                )
+            ]
+
+            return {"index": index, "output": results[0]}
+
+        # A fixed pool of workers takes the inputs one by one, so a batch
+        # never occupies all upstream slots and requests of other jobs can be
+        # interleaved with it
+        remaining = iter(enumerate(llm_inputs))
+        results = asyncio.Queue()
+
+        async def worker():
+            for index, llm_input in remaining:
+                try:
+                    result = await run(index, llm_input)
+                except Exception as e:
+                    result = {"index": index, "output": {"error": str(e)}}
+
+                await results.put(result)
+
+        workers = min(max(_UPSTREAM_PARALLEL - 1, 1), len(llm_inputs))
+        tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+
+        try:
+            for _ in range(len(llm_inputs)):
+                yield await results.get()
+        finally:
+            # Do not leave requests running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+
+
+class LlamaCPPOpenAIEngine:
     """
     Concrete OpenAI-compatible engine that uses the OpenAI client to perform
     model listing and completions against a locally hosted inference service.
@@ -158,15 +585,13 @@ class LlamaCPPOpenAIEngine(LlamaCPPEngine):
         """
         Initialize the LlamaCPPOpenAIEngine.
 
-        Loads environment variables and prints an initialization message. No
-        network calls are made here.
+        Logs an initialization message. No network calls are made here.
 
         Example:
             engine = LlamaCPPOpenAIEngine()
         """
 
-        load_dotenv()
-        print("LlamaCPPOpenAIEngine initialized")
+        logger.info("LlamaCPPOpenAIEngine initialized")
 
     async def generate(self, job_input):
         """
@@ -193,25 +618,26 @@ class LlamaCPPOpenAIEngine(LlamaCPPEngine):
         # for now e just mock the response
         if job_input.openai_route == "/v1/models":
             # Async response
-            async for response in self._handle_model_request():
+            async for response in self.list_models():
                 yield response
         elif job_input.openai_route in [
             "/v1/chat/completions",
             "/v1/completions",
         ]:
-            async for response in self._handle_chat_or_completion_request(
+            async for response in self.generate_chat_or_completion(
                 openai_input,
                 chat=job_input.openai_route == "/v1/chat/completions",
+                disk_cache=job_input.enable_cache,
             ):
                 yield response
         else:
             yield {"error": "invalid route"}
 
-    async def _handle_model_request(self):
+    async def list_models(self):
         """
         Handle a model-listing request using the OpenAI client.
 
-        This method calls client.models.list() and yields a single dict that
+        This method awaits client.models.list() and yields a single dict that
         mirrors the structure of OpenAI's model list responses:
             {"object": "list", "data": [<model dicts>]}
 
@@ -224,7 +650,7 @@ class LlamaCPPOpenAIEngine(LlamaCPPEngine):
         """
 
         try:
-            response = client.models.list()
+            response = await client.models.list()
 
             yield {
                 "object": "list",
@@ -233,35 +659,46 @@ class LlamaCPPOpenAIEngine(LlamaCPPEngine):
         except Exception as e:
             yield {"error": str(e)}
 
-    async def _handle_chat_or_completion_request(
-        self, openai_input, chat=False
+    async def generate_chat_or_completion(
+        self, openai_input, chat=False, disk_cache=False
     ):
         """
         Handle a chat or completion request and yield responses or streaming
         chunks.
 
-        This method chooses between client.chat.completions.create and
-        client.completions.create based on the 'chat' flag. If the input
-        requests non-streaming behavior (openai_input.get("stream") is falsy),
-        it yields a single dict representation of the response. If streaming is
-        requested, it iterates over the streaming response and yields
-        JSON-formatted chunks prefixed with "data: ", matching common SSE-like
-        streaming conventions.
+        This method chooses between client.chat.completions and
+        client.completions based on the 'chat' flag. If the input requests
+        non-streaming behavior (openai_input.get("stream") is falsy), it yields
+        a single dict representation of the response. If streaming is
+        requested, it forwards the server-sent events of the upstream response
+        verbatim, i.e. JSON-formatted chunks prefixed with "data: ", without
+        parsing and re-serializing each chunk.
 
         Args:
             openai_input (dict): Parameters to pass to the client's create
                 method.
             chat (bool): If True, call the chat completion endpoint; otherwise,
                 call the standard completion endpoint.
+            disk_cache (bool): If True, deterministic non-streaming responses
+                are also served from and stored in the disk cache.
 
         Yields:
             dict or str:
-                - For non-stream: yields the full response as a dict.
+                - For non-stream: yields the full response as a dict, parsed
+                  directly from the server's response body.
                 - For stream: yields strings of the form "data: <json>\\n\\n"
-                  for each chunk, and finally "data: [DONE]".
+                  for each chunk (chunks arriving within STREAM_COALESCE_MS
+                  are combined into one string), and finally "data: [DONE]".
                 - On error: yields {"error": "<message>"}.
 
         Notes:
+            - Non-streaming requests with temperature == 0 are served from an
+              in-process TTL cache when CACHE_ENABLED is set, and
+              from the disk cache if disk_cache is True.
+            - Unless LLAMA_CACHE_PROMPT is disabled, cache_prompt is sent to
+              llama.cpp so shared prompt prefixes are not evaluated again.
+            - At most UPSTREAM_PARALLEL requests are sent to llama.cpp at the
+              same time; further requests wait for a free slot.
             - Exceptions are caught and yielded as error dictionaries so the
               async generator consumer can handle them without dealing with
               exceptions.
@@ -270,25 +707,96 @@ class LlamaCPPOpenAIEngine(LlamaCPPEngine):
         """
 
         try:
-            # Call openai.chat.completions.create or openai.completions.create
-            # based on the route
-            if chat:
-                response = client.chat.completions.create(**openai_input)
-            else:
-                response = client.completions.create(**openai_input)
+            # Use openai.chat.completions or openai.completions based on the
+            # route
+            completions = (
+                client.chat.completions if chat else client.completions
+            )
+
+            # cache_prompt is a llama.cpp extension, so it has to be sent as
+            # part of the extra body; explicit values from the job win
+            if _CACHE_PROMPT:
+                openai_input = {
+                    **openai_input,
+                    "extra_body": {
+                        "cache_prompt": True,
+                        **(openai_input.get("extra_body") or {}),
+                    },
+                }
 
             # If streaming is False, we can just return the response
             if not openai_input.get("stream", False):
-                yield response.to_dict()
+                # Only deterministic responses are served from the caches
+                deterministic = openai_input.get("temperature", 1.0) == 0
+                cacheable = _CACHE_ENABLED and deterministic
+                disk_cacheable = disk_cache and deterministic
+
+                if cacheable or disk_cacheable:
+                    key = _response_cache_key(openai_input)
+
+                if cacheable:
+                    cached = _RESPONSE_CACHE.get(key)
+
+                    if cached is not None:
+                        logger.debug("x-cache: hit")
+                        yield orjson.loads(cached)
+                        return
+
+                    logger.debug("x-cache: miss")
+
+                if disk_cacheable:
+                    cached = await _disk_cache_get(key)
+
+                    if cached is not None:
+                        logger.debug("x-disk-cache: hit")
+
+                        if cacheable:
+                            _response_cache_set(key, cached)
+
+                        yield orjson.loads(cached)
+                        return
+
+                    logger.debug("x-disk-cache: miss")
+
+                # Parse the raw response body instead of building the SDK's
+                # response model and converting it back to a dict
+                async with _UPSTREAM_SEM:
+                    response = await completions.with_raw_response.create(
+                        **openai_input
+                    )
+
+                body = response.http_response.content
+                result = orjson.loads(body)
+
+                if cacheable:
+                    _response_cache_set(key, body)
+
+                if disk_cacheable:
+                    await _disk_cache_set(key, body)
+
+                yield result
                 return
 
-            for chunk in response:
-                # Return json of the chunk without any line breaks
-                yield "data: " + json.dumps(
-                    chunk.to_dict(), separators=(",", ":")
-                ) + "\n\n"
+            async with _UPSTREAM_SEM:
+                async with completions.with_streaming_response.create(
+                    **openai_input
+                ) as response:
+                    # Forward the upstream chunks as-is; the terminating
+                    # [DONE] event is sent by us below
+                    events = (
+                        line + SSE_SUFFIX
+                        async for line in response.iter_lines()
+                        if line.startswith(SSE_PREFIX) and line != SSE_DONE
+                    )
+
+                    async for batch in _coalesce(events):
+                        yield batch
 
-            yield "data: [DONE]"
+            yield SSE_DONE
 
         except Exception as e:
             yield {"error": str(e)}
+
+
+# Shared OpenAI-compatible engine, used by LlamaCPPEngine to delegate requests
+openai_engine = LlamaCPPOpenAIEngine()
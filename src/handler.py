@@ -1,21 +1,38 @@
 """
 Runpod handler for processing jobs using LlamaCPP or OpenAI engines. This
 module defines an asynchronous handler function that receives job inputs,
-instantiates the appropriate engine based on the job input, and yields
-generated output in a streaming fashion.
+picks the appropriate engine based on the job input, and yields generated
+output in a streaming fashion. The engines are instantiated once at import
+time and shared across all jobs.
 """
 
 from typing import Any
+import asyncio
+import logging
 import runpod
 import os
-from utils import JobInput
-from engine import LlamaCPPEngine, LlamaCPPOpenAIEngine
+import uvloop
+
+# configure logging once for the whole worker, before the engine module is
+# imported so that the messages logged while it is set up are not lost;
+# per-request details are only logged at DEBUG level
+logging.basicConfig(level=logging.INFO)
+
+# httpx logs every request to llama.cpp at INFO level
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+from utils import JobInput  # noqa: E402
+from engine import LlamaCPPEngine, openai_engine  # noqa: E402
 
 # set max concurrency from environment variable or default
 DEFAULT_MAX_CONCURRENCY = 8
 
 max_concurrency = int(os.getenv("MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
 
+# engines are stateless per job, so a single instance of each is reused
+# (the OpenAI-compatible engine is shared with LlamaCPPEngine via engine.py)
+_llama_engine = LlamaCPPEngine()
+
 
 async def handler(job: Any):
     """
@@ -25,10 +42,7 @@ async def handler(job: Any):
     """
 
     job_input = JobInput(job["input"])
-    engine_class = (
-        LlamaCPPOpenAIEngine if job_input.openai_route else LlamaCPPEngine
-    )
-    engine = engine_class()
+    engine = openai_engine if job_input.openai_route else _llama_engine
 
     job = engine.generate(job_input)
 
@@ -36,6 +50,10 @@ async def handler(job: Any):
         yield batch
 
 
+# use uvloop instead of the default asyncio event loop, as the worker spends
+# most of its time forwarding small streaming chunks between sockets
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 runpod.serverless.start(
     {
         "handler": handler,
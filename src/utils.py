@@ -6,22 +6,43 @@ This module contains utility classes and functions for handling job inputs.
 class JobInput:
     """
     Class to parse and store job input data. It extracts fields such as
-    llm_input, stream, openai_route, and openai_input from the provided job
-    dictionary.
+    llm_input, is_chat, llm_inputs, temperature, stream, enable_cache,
+    openai_route, and openai_input from the provided job dictionary.
     """
 
+    # A JobInput is created for every job; slots avoid a per-instance __dict__
+    __slots__ = (
+        "llm_input",
+        "is_chat",
+        "llm_inputs",
+        "temperature",
+        "stream",
+        "enable_cache",
+        "openai_route",
+        "openai_input",
+    )
+
     def __init__(self, job):
         """
         Initialize the JobInput instance by parsing the job dictionary.
 
         Default values:
         - llm_input: job["messages"] if present, else job["prompt"]
+        - is_chat: True if llm_input holds chat messages, else False
+        - llm_inputs: job["prompts"] (a list of prompts and/or message lists
+          to process as a batch), else None
+        - temperature: None (use the server's default)
         - stream: False
+        - enable_cache: False
         - openai_route: None
         - openai_input: None
         """
 
-        self.llm_input = job.get("messages", job.get("prompt"))
+        self.is_chat = "messages" in job
+        self.llm_input = job["messages"] if self.is_chat else job.get("prompt")
+        self.llm_inputs = job.get("prompts")
+        self.temperature = job.get("temperature")
         self.stream = job.get("stream", False)
+        self.enable_cache = job.get("enable_cache", False)
         self.openai_route = job.get("openai_route")
         self.openai_input = job.get("openai_input")